@@ -82,6 +82,28 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/3.0/topics/cache/
+# Use a shared backend (memcached, database) in production so request
+# coalescing and rate limiting apply across workers.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Seconds a rendered Missa propers page stays cached. Saving or deleting
+# through the models anything a page shows (missae, antiphonae, propers,
+# suggestions, MissaTypes and their slots, anni, antiphona types, documenta)
+# drops the affected pages right away; this bounds the staleness of anything
+# else, like raw SQL or queryset.update().
+ANTIPHONA_PROPERS_CACHE_TIMEOUT = 300
+
+# Token bucket per client: (tokens refilled per second, bucket capacity)
+ANTIPHONA_RATE_LIMIT = (10, 30)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.0/ref/settings/#auth-password-validators
 
@@ -119,3 +141,9 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/3.0/howto/static-files/
 
 STATIC_URL = '/static/'
+
+
+# Offline snapshots
+# Where export_snapshot writes the SQLite snapshots served to offline clients
+
+ANTIPHONA_SNAPSHOT_DIR = os.path.join(BASE_DIR, 'snapshots')
@@ -21,5 +21,5 @@ from django.urls import include, path
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('/', include('antiphona_app.urls')),
+    path('', include('antiphona_app.urls')),
 ]
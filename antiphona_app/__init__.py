@@ -0,0 +1 @@
+default_app_config = 'antiphona_app.apps.AntiphonaAppConfig'
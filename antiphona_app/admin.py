@@ -6,6 +6,7 @@ from antiphona_app.models import (
     Antiphona,
     Antiphona_Missa,
     AntiphonaType,
+    ChangeLogEntry,
     Documentum,
     Missa,
     MissaType,
@@ -14,11 +15,27 @@ from antiphona_app.models import (
 )
 
 
+class ChangeLogEntryAdmin(admin.ModelAdmin):
+    """The change log is append-only, so it can only be browsed here."""
+    list_display = ('sequence', 'model', 'object_id', 'action', 'timestamp')
+    list_filter = ('model', 'action')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
 # Register your models here.
 admin.site.register(Anno)
 admin.site.register(Antiphona)
 admin.site.register(Antiphona_Missa)
 admin.site.register(AntiphonaType)
+admin.site.register(ChangeLogEntry, ChangeLogEntryAdmin)
 admin.site.register(Documentum)
 admin.site.register(Missa)
 admin.site.register(MissaType)
@@ -3,3 +3,9 @@ from django.apps import AppConfig
 
 class AntiphonaAppConfig(AppConfig):
     name = 'antiphona_app'
+
+    def ready(self):
+        from antiphona_app.propers import connect_invalidation
+        from antiphona_app.signals import connect_signals
+        connect_signals()
+        connect_invalidation()
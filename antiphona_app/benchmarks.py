@@ -0,0 +1,56 @@
+"""Compares reading the propers as model instances against value tuples."""
+
+import gc
+import time
+import tracemalloc
+from collections import defaultdict
+
+from antiphona_app.models import Antiphona_Missa
+from antiphona_app.propers import load_propers
+
+
+def load_propers_as_models(missae):
+    """The model instance path: {missa id: [Antiphona_Missa, ...]} with everything prefetched."""
+    propers = defaultdict(list)
+    queryset = (
+        Antiphona_Missa.objects.filter(missa__in=missae)
+        .select_related('antiphona', 'antiphona_type', 'anno', 'documentum')
+        .prefetch_related('suggestion_set')
+        .order_by('id')
+    )
+    for proper in queryset:
+        propers[proper.missa_id].append(proper)
+    return propers
+
+
+def measure(load, missae, repeat=3):
+    """
+    Returns the best time (s) and peak memory (bytes) of load(missae).
+
+    Tracing slows allocation-heavy code down unevenly, so the timed runs
+    aren't traced and the peak memory comes from a separate traced run.
+    """
+    best_time = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        load(missae)
+        elapsed = time.perf_counter() - start
+        best_time = elapsed if best_time is None else min(best_time, elapsed)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        load(missae)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best_time, peak
+
+
+def compare_propers_loading(missae, repeat=3):
+    """Returns {path name: (best seconds, peak bytes)} for both read paths."""
+    return {
+        "models": measure(load_propers_as_models, missae, repeat),
+        "values": measure(load_propers, missae, repeat),
+    }
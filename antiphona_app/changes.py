@@ -0,0 +1,53 @@
+"""
+Change-data feed for the propers.
+
+Edits to the tracked models are appended to the ChangeLogEntry table
+so downstream consumers (caches, exports, search indexes) can sync
+incrementally instead of re-reading every table.
+"""
+
+from antiphona_app.models import ChangeLogEntry
+
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def record_change(instance, action):
+    """Appends a ChangeLogEntry for the given model instance."""
+    return ChangeLogEntry.objects.create(
+        model=instance._meta.model_name,
+        object_id=instance.pk,
+        action=action,
+    )
+
+
+def changes_since(sequence=0, limit=DEFAULT_PAGE_SIZE):
+    """
+    Returns the page of changes after the given sequence number.
+
+    The result is a tuple (entries, next_sequence, has_more), where
+    next_sequence is the last sequence served (or the given one if the
+    page is empty), to be passed as-is on the next call, and has_more
+    tells whether there are more changes already.
+
+    Sequence order only matches commit order on SQLite, which serializes
+    writes. On a backend with concurrent writers a reader may see N+1
+    committed before N, and then skip N for good.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    entries = list(ChangeLogEntry.objects.filter(sequence__gt=sequence)[:limit + 1])
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    return entries, entries[-1].sequence if entries else sequence, has_more
+
+
+def serialize_change(entry):
+    """Returns a ChangeLogEntry as a JSON-friendly dict."""
+    return {
+        "sequence": entry.sequence,
+        "model": entry.model,
+        "object_id": entry.object_id,
+        "action": entry.action,
+        "timestamp": entry.timestamp.isoformat(),
+    }
@@ -0,0 +1,225 @@
+"""
+A self-contained load-testing harness for the WSGI and ASGI applications.
+
+The application is driven in-process: through a threaded wsgiref server
+on a free local port for WSGI, or by calling the ASGI callable directly.
+A weighted, seeded plan of requests is replayed by concurrent workers
+and latencies are collected per endpoint.
+"""
+
+import asyncio
+import json
+import queue
+import random
+import threading
+import time
+import urllib.request
+from collections import defaultdict, namedtuple
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import Client
+from django.urls import reverse
+
+
+Endpoint = namedtuple('Endpoint', ['name', 'weight', 'path', 'headers'], defaults=[{}])
+Result = namedtuple('Result', ['endpoint', 'seconds', 'ok'])
+
+
+def admin_session_headers():
+    """Creates a superuser and returns the headers of a request logged in as it."""
+    user = get_user_model().objects.create_superuser('loadtest', 'loadtest@example.com', None)
+    client = Client()
+    client.force_login(user)
+    session = client.cookies[settings.SESSION_COOKIE_NAME]
+    return {'Cookie': f"{session.key}={session.value}"}
+
+
+def request_mix(missa_ids, last_sequence, admin_headers=None):
+    """
+    Returns the endpoints to exercise, with their relative weights.
+    Logged in admin pages are included if admin_headers are given.
+    """
+    endpoints = (
+        Endpoint('missa propers', 60, lambda rng: reverse('missa-propers', args=[rng.choice(missa_ids)])),
+        Endpoint('changes feed', 20, lambda rng: f"{reverse('changes')}?since={rng.randint(0, last_sequence)}"),
+        Endpoint('snapshots', 10, lambda rng: reverse('snapshots')),
+        Endpoint('admin login', 5, lambda rng: reverse('admin:login')),
+    )
+    if admin_headers:
+        endpoints += (
+            Endpoint('admin missae', 5, lambda rng: reverse('admin:antiphona_app_missa_changelist'), admin_headers),
+        )
+    return endpoints
+
+
+def build_plan(endpoints, requests, seed=0):
+    """Returns a reproducible list of (endpoint name, path, headers) to request."""
+    rng = random.Random(seed)
+    chosen = rng.choices(endpoints, weights=[endpoint.weight for endpoint in endpoints], k=requests)
+    return [(endpoint.name, endpoint.path(rng), endpoint.headers) for endpoint in chosen]
+
+
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+    # socketserver listens with a backlog of 5; connects beyond it wait for
+    # a SYN retry, which would be reported as application latency
+    request_queue_size = 128
+
+
+def _server_class(concurrency):
+    """Returns a server class whose listen backlog fits every worker's connect."""
+    if concurrency <= _ThreadingWSGIServer.request_queue_size:
+        return _ThreadingWSGIServer
+    return type('_ThreadingWSGIServer', (_ThreadingWSGIServer,), {'request_queue_size': concurrency})
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def run_wsgi(application, plan, concurrency):
+    """Replays the plan against a local WSGI server. Returns (results, seconds)."""
+    server = make_server('127.0.0.1', 0, application, _server_class(concurrency), _QuietHandler)
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    pending = queue.Queue()
+    for item in plan:
+        pending.put(item)
+    results = []
+
+    def worker():
+        while True:
+            try:
+                name, path, headers = pending.get_nowait()
+            except queue.Empty:
+                return
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(urllib.request.Request(base_url + path, headers=headers)) as response:
+                    response.read()
+                ok = True
+            except Exception:
+                # every planned request must produce a result, or errors go uncounted
+                ok = False
+            results.append(Result(name, time.perf_counter() - start, ok))
+
+    workers = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    server.shutdown()
+    server.server_close()
+    return results, elapsed
+
+
+async def _asgi_request(application, path, headers):
+    """Sends a GET to the ASGI application and returns the response status."""
+    path, _, query_string = path.partition('?')
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query_string.encode(),
+        'root_path': '',
+        'headers': [(b'host', b'127.0.0.1')] + [
+            (name.lower().encode(), value.encode()) for name, value in headers.items()
+        ],
+        'client': ('127.0.0.1', 0),
+        'server': ('127.0.0.1', 80),
+    }
+    status = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status.append(message['status'])
+
+    await application(scope, receive, send)
+    return status[0]
+
+
+def run_asgi(application, plan, concurrency):
+    """Replays the plan against the ASGI application. Returns (results, seconds)."""
+    results = []
+
+    async def worker(pending):
+        while pending:
+            name, path, headers = pending.pop()
+            start = time.perf_counter()
+            try:
+                ok = await _asgi_request(application, path, headers) < 400
+            except Exception:
+                ok = False
+            results.append(Result(name, time.perf_counter() - start, ok))
+
+    async def main():
+        pending = list(reversed(plan))
+        await asyncio.gather(*(worker(pending) for _ in range(concurrency)))
+
+    start = time.perf_counter()
+    asyncio.run(main())
+    return results, time.perf_counter() - start
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return 0
+    return values[min(len(values) - 1, max(0, int(round(fraction * len(values))) - 1))]
+
+
+def summarize(results, elapsed):
+    """Returns throughput, latency percentiles (ms) and error rate per endpoint and in total."""
+    by_endpoint = defaultdict(list)
+    for result in results:
+        by_endpoint[result.endpoint].append(result)
+        by_endpoint['total'].append(result)
+
+    summary = {}
+    for name, endpoint_results in by_endpoint.items():
+        latencies = sorted(result.seconds * 1000 for result in endpoint_results)
+        errors = sum(not result.ok for result in endpoint_results)
+        summary[name] = {
+            "requests": len(endpoint_results),
+            "throughput": len(endpoint_results) / elapsed if elapsed else 0,
+            "p50": percentile(latencies, 0.50),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+            "error_rate": errors / len(endpoint_results),
+        }
+    return summary
+
+
+def format_summary(summary):
+    """Renders a summary as a text table, total last."""
+    lines = [
+        f"{'endpoint':<16}{'requests':>10}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>9}"
+    ]
+    for name in sorted(summary, key=lambda name: (name == 'total', name)):
+        row = summary[name]
+        lines.append(
+            f"{name:<16}{row['requests']:>10}{row['throughput']:>10.1f}{row['p50']:>10.2f}"
+            f"{row['p95']:>10.2f}{row['p99']:>10.2f}{row['error_rate']:>9.2%}"
+        )
+    return '\n'.join(lines)
+
+
+def dump_summary(summary):
+    """Renders a summary as JSON, to compare runs."""
+    return json.dumps(summary, indent=2, sort_keys=True)
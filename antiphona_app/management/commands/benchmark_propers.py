@@ -0,0 +1,31 @@
+"""Benchmarks the propers read path against a seeded throwaway database."""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_databases, teardown_databases
+
+from antiphona_app.benchmarks import compare_propers_loading
+from antiphona_app.models import Missa
+from antiphona_app.seed import seed_propers
+
+
+class Command(BaseCommand):
+    help = "Compares time and peak memory of loading propers as model instances and as value tuples."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--missae', type=int, default=1000, help="Missae to seed and load.")
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        if options['missae'] < 1 or options['repeat'] < 1:
+            raise CommandError("missae and repeat must be positive")
+
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            seed_propers(missae=options['missae'], antiphonae=options['missae'] * 2)
+            results = compare_propers_loading(Missa.objects.all(), options['repeat'])
+        finally:
+            teardown_databases(old_config, verbosity=0)
+
+        self.stdout.write(f"{'path':<8}{'time ms':>12}{'peak KiB':>12}")
+        for name, (seconds, peak) in results.items():
+            self.stdout.write(f"{name:<8}{seconds * 1000:>12.1f}{peak / 1024:>12.0f}")
@@ -0,0 +1,28 @@
+"""Prints the change log entries after a given sequence number."""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from antiphona_app.changes import DEFAULT_PAGE_SIZE, changes_since, serialize_change
+
+
+class Command(BaseCommand):
+    help = "Prints the propers changes after a sequence number, one JSON object per line."
+
+    def add_arguments(self, parser):
+        parser.add_argument('since', type=int, nargs='?', default=0)
+        parser.add_argument('--limit', type=int, default=DEFAULT_PAGE_SIZE, help="Page size.")
+        parser.add_argument('--all', action='store_true', help="Follow every page until up to date.")
+
+    def handle(self, *args, **options):
+        since = options['since']
+        if since < 0 or options['limit'] < 1:
+            raise CommandError("since must be non-negative and limit positive")
+
+        has_more = True
+        while has_more:
+            entries, since, has_more = changes_since(since, options['limit'])
+            for entry in entries:
+                self.stdout.write(json.dumps(serialize_change(entry)))
+            has_more = has_more and options['all']
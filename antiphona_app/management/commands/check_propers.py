@@ -0,0 +1,24 @@
+"""Reports the missae whose propers don't match their MissaType template."""
+
+from django.core.management.base import BaseCommand
+
+from antiphona_app.missa_templates import validate_missae
+
+
+class Command(BaseCommand):
+    help = "Reports missing and extra propers for every Missa."
+
+    def handle(self, *args, **options):
+        incomplete = 0
+        reports = validate_missae()
+        for report in reports:
+            if not (report.missing or report.extra):
+                continue
+            incomplete += 1
+            self.stdout.write(f"{report.missa_name} (#{report.missa_id})")
+            if report.missing:
+                self.stdout.write(f"  missing: {', '.join(report.missing)}")
+            if report.extra:
+                self.stdout.write(f"  extra: {', '.join(report.extra)}")
+
+        self.stdout.write(f"{incomplete} of {len(reports)} missae have incomplete or extra propers.")
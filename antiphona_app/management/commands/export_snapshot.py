@@ -0,0 +1,22 @@
+"""Exports the propers dataset as a SQLite snapshot for offline clients."""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from antiphona_app.snapshots import export_snapshot
+
+
+class Command(BaseCommand):
+    help = "Writes a full SQLite snapshot, or a delta since a previous version."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', type=int, help="Write only the changes after this version.")
+        parser.add_argument('--output-dir', help="Defaults to ANTIPHONA_SNAPSHOT_DIR.")
+
+    def handle(self, *args, **options):
+        if options['since'] is not None and options['since'] < 0:
+            raise CommandError("since must be non-negative")
+        try:
+            path = export_snapshot(options['since'], options['output_dir'])
+        except ValueError as error:
+            raise CommandError(error)
+        self.stdout.write(path)
@@ -0,0 +1,66 @@
+"""Load tests the WSGI or ASGI application against a seeded throwaway database."""
+
+from Antiphona import asgi, wsgi
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings, setup_databases, teardown_databases
+
+from antiphona_app import loadtest
+from antiphona_app.models import ChangeLogEntry
+from antiphona_app.seed import seed_propers
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a test database, replays a weighted mix of requests against the "
+        "application and reports throughput, latency percentiles and error rates."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interface', choices=('wsgi', 'asgi'), default='wsgi')
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--concurrency', type=int, default=10)
+        parser.add_argument('--missae', type=int, default=200, help="Missae to seed.")
+        parser.add_argument('--seed', type=int, default=0, help="Seed for the dataset and the request plan.")
+        parser.add_argument('--rate-limit', action='store_true', help="Keep the per client rate limit.")
+        parser.add_argument('--json', action='store_true', help="Print the summary as JSON.")
+        parser.add_argument(
+            '--max-error-rate', type=float,
+            help="Fail if the total error rate is above this fraction.",
+        )
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or options['concurrency'] < 1:
+            raise CommandError("requests and concurrency must be positive")
+
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            summary = self.run(options)
+        finally:
+            teardown_databases(old_config, verbosity=0)
+
+        self.stdout.write(loadtest.dump_summary(summary) if options['json'] else loadtest.format_summary(summary))
+        if options['max_error_rate'] is not None and summary['total']['error_rate'] > options['max_error_rate']:
+            raise CommandError(f"error rate {summary['total']['error_rate']:.2%} over the maximum")
+
+    def run(self, options):
+        missa_ids = seed_propers(missae=options['missae'], seed=options['seed'])
+        last_sequence = ChangeLogEntry.objects.order_by('-sequence').values_list('sequence', flat=True).first()
+        plan = loadtest.build_plan(
+            loadtest.request_mix(missa_ids, last_sequence or 0, loadtest.admin_session_headers()),
+            options['requests'],
+            options['seed'],
+        )
+        cache.clear()
+
+        overrides = {'ALLOWED_HOSTS': settings.ALLOWED_HOSTS + ['127.0.0.1']}
+        if not options['rate_limit']:
+            # every request comes from the same client
+            overrides['ANTIPHONA_RATE_LIMIT'] = (10 ** 9, 10 ** 9)
+        with override_settings(**overrides):
+            if options['interface'] == 'wsgi':
+                results, elapsed = loadtest.run_wsgi(wsgi.application, plan, options['concurrency'])
+            else:
+                results, elapsed = loadtest.run_asgi(asgi.application, plan, options['concurrency'])
+        return loadtest.summarize(results, elapsed)
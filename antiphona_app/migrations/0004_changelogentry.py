@@ -0,0 +1,26 @@
+# Generated by Django 3.0.5 on 2026-10-19 16:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('antiphona_app', '0003_auto_20200413_1209'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLogEntry',
+            fields=[
+                ('sequence', models.BigAutoField(primary_key=True, serialize=False)),
+                ('model', models.CharField(max_length=40)),
+                ('object_id', models.PositiveIntegerField()),
+                ('action', models.CharField(choices=[('created', 'Created'), ('updated', 'Updated'), ('deleted', 'Deleted')], max_length=7)),
+                ('timestamp', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ('sequence',),
+            },
+        ),
+    ]
@@ -0,0 +1,72 @@
+"""
+MissaType templates resolved in memory.
+
+A MissaType, through its ordered MissaType_AntiphonaType links, defines
+which antiphona slots a Missa has. Templates are loaded once into an
+immutable structure so any number of missae can be checked against
+them in a single batched pass.
+"""
+
+from collections import defaultdict, namedtuple
+from types import MappingProxyType
+
+from antiphona_app.models import Antiphona_Missa, Missa, MissaType_AntiphonaType
+
+
+Slot = namedtuple('Slot', ['order', 'antiphona_type_id', 'antiphona_type_name'])
+Template = namedtuple('Template', ['missa_type_id', 'missa_type_name', 'slots'])
+PropersReport = namedtuple('PropersReport', ['missa_id', 'missa_name', 'missing', 'extra'])
+
+
+def load_templates():
+    """Returns a read-only mapping of MissaType id to its Template, in one query."""
+    slots = defaultdict(list)
+    names = {}
+    links = MissaType_AntiphonaType.objects.order_by('missa_type_id', 'order').values_list(
+        'missa_type_id', 'missa_type__name', 'order', 'antiphona_type_id', 'antiphona_type__name',
+    )
+    for missa_type_id, missa_type_name, order, antiphona_type_id, antiphona_type_name in links:
+        names[missa_type_id] = missa_type_name
+        slots[missa_type_id].append(Slot(order, antiphona_type_id, antiphona_type_name))
+    return MappingProxyType({
+        missa_type_id: Template(missa_type_id, names[missa_type_id], tuple(type_slots))
+        for missa_type_id, type_slots in slots.items()
+    })
+
+
+def validate_missae(missae=None, templates=None):
+    """
+    Checks the propers of the given missae against their templates.
+
+    Takes a Missa queryset (every Missa by default) and returns a
+    PropersReport per missa, in two queries regardless of how many
+    missae there are. Missing and extra hold antiphona type names.
+    """
+    if templates is None:
+        templates = load_templates()
+    if missae is None:
+        missae = Missa.objects.all()
+    # sorted here rather than with order_by(), which sliced querysets reject
+    rows = sorted(missae.values_list('id', 'name', 'missa_type_id'))
+
+    filled = defaultdict(set)
+    propers = Antiphona_Missa.objects.filter(missa__in=missae).values_list(
+        'missa_id', 'antiphona_type_id', 'antiphona_type__name',
+    )
+    type_names = {}
+    for missa_id, antiphona_type_id, antiphona_type_name in propers:
+        filled[missa_id].add(antiphona_type_id)
+        type_names[antiphona_type_id] = antiphona_type_name
+
+    reports = []
+    for missa_id, missa_name, missa_type_id in rows:
+        template = templates.get(missa_type_id)
+        slots = template.slots if template else ()
+        expected = {slot.antiphona_type_id for slot in slots}
+        reports.append(PropersReport(
+            missa_id,
+            missa_name,
+            tuple(slot.antiphona_type_name for slot in slots if slot.antiphona_type_id not in filled[missa_id]),
+            tuple(sorted(type_names[type_id] for type_id in filled[missa_id] - expected)),
+        ))
+    return reports
@@ -129,3 +129,32 @@ class Suggestion(models.Model):
 
     def __str__(self):
         return f"Suggestion: {self.song_name} - {self.author}, for {self.antiphona_missa}"
+
+
+class ChangeLogEntry(models.Model):
+    """
+    An append-only record of an edit to the propers.
+
+    The sequence is monotonically increasing, so downstream consumers
+    can remember the last one they saw and ask only for newer changes.
+    """
+    CREATED = 'created'
+    UPDATED = 'updated'
+    DELETED = 'deleted'
+    ACTION_CHOICES = (
+        (CREATED, 'Created'),
+        (UPDATED, 'Updated'),
+        (DELETED, 'Deleted'),
+    )
+
+    sequence = models.BigAutoField(primary_key=True)
+    model = models.CharField(max_length=40)
+    object_id = models.PositiveIntegerField()
+    action = models.CharField(max_length=7, choices=ACTION_CHOICES)
+    timestamp = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ('sequence',)
+
+    def __str__(self):
+        return f"#{self.sequence}: {self.model} {self.object_id} {self.action}"
@@ -0,0 +1,202 @@
+"""
+Builds the propers of a Missa, ready to be rendered.
+
+The propers are read as plain values() rows into named tuples instead of
+model instances: rendering a whole season would otherwise build
+thousands of instances carrying _state and field caches that are never
+used. Repeated strings (antiphona texts, types, psalms) are shared
+between the tuples of a single load.
+"""
+
+from collections import defaultdict, namedtuple
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+
+from antiphona_app.models import (
+    Anno,
+    Antiphona,
+    Antiphona_Missa,
+    AntiphonaType,
+    Documentum,
+    Missa,
+    MissaType,
+    MissaType_AntiphonaType,
+    Suggestion,
+)
+
+
+ProperValue = namedtuple('ProperValue', [
+    'id', 'missa_id', 'antiphona_type_id', 'antiphona_type', 'antiphona', 'text',
+    'anno', 'evangelium', 'documentum', 'psalm', 'alt_psalm', 'suggestions',
+])
+SuggestionValue = namedtuple('SuggestionValue', [
+    'id', 'song_name', 'author', 'audio_link', 'sheet_link', 'similarity',
+])
+
+PROPER_FIELDS = (
+    'id', 'missa_id', 'antiphona_type_id', 'antiphona_type__name', 'antiphona__name', 'antiphona__text',
+    'anno__name', 'evangelium', 'documentum__name', 'psalm', 'alt_psalm',
+)
+SUGGESTION_FIELDS = (
+    'antiphona_missa_id', 'id', 'song_name', 'author', 'audio_link', 'sheet_link', 'similarity',
+)
+
+
+def propers_cache_key(missa_id):
+    """Returns the cache key of the rendered propers of a Missa."""
+    return f"propers:{missa_id}"
+
+
+def invalidate_propers(missa_ids):
+    """Drops the cached propers of the given missae."""
+    cache.delete_many([propers_cache_key(missa_id) for missa_id in missa_ids])
+
+
+def _touched_missae(instance):
+    """Returns the ids of the missae whose propers show instance."""
+    if isinstance(instance, Missa):
+        return [instance.pk]
+    if isinstance(instance, Antiphona_Missa):
+        return [instance.missa_id]
+    if isinstance(instance, Suggestion):
+        return Antiphona_Missa.objects.filter(id=instance.antiphona_missa_id).values_list('missa_id', flat=True)
+    if isinstance(instance, Antiphona):
+        return Antiphona_Missa.objects.filter(antiphona=instance).values_list('missa_id', flat=True)
+    if isinstance(instance, MissaType):
+        return Missa.objects.filter(missa_type=instance).values_list('id', flat=True)
+    if isinstance(instance, MissaType_AntiphonaType):
+        return Missa.objects.filter(missa_type_id=instance.missa_type_id).values_list('id', flat=True)
+    if isinstance(instance, AntiphonaType):
+        return Missa.objects.filter(
+            Q(antiphona_missa__antiphona_type=instance) | Q(missa_type__antiphona_types=instance)
+        ).values_list('id', flat=True).distinct()
+    if isinstance(instance, Documentum):
+        return Antiphona_Missa.objects.filter(documentum=instance).values_list('missa_id', flat=True)
+    if isinstance(instance, Anno):
+        return Antiphona_Missa.objects.filter(anno=instance).values_list('missa_id', flat=True)
+    return []
+
+
+def _invalidate(missa_ids):
+    missa_ids = list(missa_ids)
+    invalidate_propers(missa_ids)
+    # again once committed, in case a reader cached the old propers meanwhile
+    transaction.on_commit(lambda: invalidate_propers(missa_ids))
+
+
+def invalidate_on_change(sender, instance, raw=False, **kwargs):
+    """Drops the cached propers an edited or deleted instance shows in."""
+    if not raw:
+        _invalidate(_touched_missae(instance))
+
+
+def invalidate_on_m2m_add(sender, instance, action, model, pk_set, **kwargs):
+    """
+    Drops the cached propers touched by the related managers' add(),
+    which bypasses post_save. Removals are caught by post_delete.
+    """
+    if action == 'post_add':
+        missa_ids = set(_touched_missae(instance))
+        for pk in pk_set:
+            missa_ids.update(_touched_missae(model(pk=pk)))
+        _invalidate(missa_ids)
+
+
+def connect_invalidation():
+    """Connects the receivers keeping the propers cache fresh."""
+    models = (
+        Antiphona, Missa, Antiphona_Missa, Suggestion, MissaType_AntiphonaType,
+        Anno, AntiphonaType, Documentum, MissaType,
+    )
+    for model in models:
+        post_save.connect(invalidate_on_change, sender=model, dispatch_uid=f"propers_save_{model._meta.model_name}")
+        # a deleted MissaType's missae are moved to the default type before
+        # post_delete, so they have to be collected beforehand
+        delete_signal = pre_delete if model is MissaType else post_delete
+        delete_signal.connect(
+            invalidate_on_change, sender=model, dispatch_uid=f"propers_delete_{model._meta.model_name}",
+        )
+    for through in (Missa.antiphonae.through, MissaType.antiphona_types.through):
+        m2m_changed.connect(
+            invalidate_on_m2m_add, sender=through, dispatch_uid=f"propers_m2m_{through._meta.model_name}",
+        )
+
+
+def load_propers(missae):
+    """
+    Returns {missa id: [ProperValue, ...]} for a Missa queryset in two
+    queries, however many missae there are. Propers are in creation order.
+    """
+    strings = {}
+
+    def share(value):
+        return strings.setdefault(value, value) if isinstance(value, str) else value
+
+    suggestions = defaultdict(list)
+    suggestion_rows = (
+        Suggestion.objects.filter(antiphona_missa__missa__in=missae)
+        .order_by('id').values_list(*SUGGESTION_FIELDS)
+    )
+    for row in suggestion_rows:
+        suggestions[row[0]].append(SuggestionValue._make(share(value) for value in row[1:]))
+
+    propers = defaultdict(list)
+    proper_rows = (
+        Antiphona_Missa.objects.filter(missa__in=missae)
+        .order_by('id').values_list(*PROPER_FIELDS)
+    )
+    for row in proper_rows:
+        values = [share(value) for value in row]
+        values.append(tuple(suggestions.get(row[0], ())))
+        propers[row[1]].append(ProperValue._make(values))
+    return propers
+
+
+def build_propers(missa_id):
+    """
+    Returns the propers of a Missa as a JSON-friendly dict, ordered
+    as its MissaType says. Raises Missa.DoesNotExist if there's no such Missa.
+    """
+    name, missa_type_id, missa_type_name = Missa.objects.values_list(
+        'name', 'missa_type_id', 'missa_type__name',
+    ).get(id=missa_id)
+    order = dict(
+        MissaType_AntiphonaType.objects.filter(missa_type_id=missa_type_id)
+        .values_list('antiphona_type_id', 'order')
+    )
+    propers = sorted(
+        load_propers(Missa.objects.filter(id=missa_id))[missa_id],
+        key=lambda proper: order.get(proper.antiphona_type_id, len(order) + 1),
+    )
+
+    return {
+        "id": missa_id,
+        "name": name,
+        "missa_type": missa_type_name,
+        "propers": [
+            {
+                "antiphona_type": proper.antiphona_type,
+                "antiphona": proper.antiphona,
+                "text": proper.text,
+                "anno": proper.anno,
+                "evangelium": proper.evangelium,
+                "documentum": proper.documentum,
+                "psalm": proper.psalm,
+                "alt_psalm": proper.alt_psalm,
+                "suggestions": [
+                    {
+                        "song_name": suggestion.song_name,
+                        "author": suggestion.author,
+                        "audio_link": suggestion.audio_link,
+                        "sheet_link": suggestion.sheet_link,
+                        "similarity": str(suggestion.similarity),
+                    }
+                    for suggestion in proper.suggestions
+                ],
+            }
+            for proper in propers
+        ],
+    }
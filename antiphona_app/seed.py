@@ -0,0 +1,91 @@
+"""Seeds a synthetic propers dataset, e.g. for load testing."""
+
+import random
+
+from antiphona_app.models import (
+    Anno,
+    Antiphona,
+    Antiphona_Missa,
+    AntiphonaType,
+    ChangeLogEntry,
+    Documentum,
+    Missa,
+    MissaType,
+    MissaType_AntiphonaType,
+    Suggestion,
+)
+
+
+def seed_propers(missae=200, antiphonae=500, suggestions_per_proper=2, seed=0):
+    """
+    Bulk creates missae with a full set of propers each, following
+    the slots of their MissaType, and returns the Missa ids.
+
+    Rows are bulk created, so the change log is filled here as well.
+    """
+    rng = random.Random(seed)
+    missa_types = list(MissaType.objects.all())
+    slots = {
+        missa_type.id: list(
+            MissaType_AntiphonaType.objects.filter(missa_type=missa_type)
+            .order_by('order').values_list('antiphona_type_id', flat=True)
+        )
+        for missa_type in missa_types
+    }
+    annos = [None] + list(Anno.objects.all())
+    documenta = list(Documentum.objects.all())
+    default_type = AntiphonaType.objects.order_by('id').first()
+
+    first_antiphona = Antiphona.objects.order_by('-id').values_list('id', flat=True).first() or 0
+    Antiphona.objects.bulk_create(
+        Antiphona(name=f"Antiphona {number}", text=f"Textus antiphonae {number}")
+        for number in range(antiphonae)
+    )
+    antiphona_ids = list(Antiphona.objects.filter(id__gt=first_antiphona).values_list('id', flat=True))
+
+    first_missa = Missa.objects.order_by('-id').values_list('id', flat=True).first() or 0
+    Missa.objects.bulk_create(
+        Missa(name=f"Missa {number}", missa_type=missa_types[number % len(missa_types)])
+        for number in range(missae)
+    )
+    missa_rows = list(Missa.objects.filter(id__gt=first_missa).values_list('id', 'missa_type_id'))
+
+    first_proper = Antiphona_Missa.objects.order_by('-id').values_list('id', flat=True).first() or 0
+    Antiphona_Missa.objects.bulk_create(
+        Antiphona_Missa(
+            antiphona_id=rng.choice(antiphona_ids),
+            missa_id=missa_id,
+            anno=rng.choice(annos),
+            antiphona_type_id=antiphona_type_id,
+            documentum=rng.choice(documenta),
+            psalm=f"Ps. {rng.randint(1, 150)}, {rng.randint(1, 20)}",
+        )
+        for missa_id, missa_type_id in missa_rows
+        for antiphona_type_id in slots[missa_type_id] or [default_type.id]
+    )
+    proper_ids = list(Antiphona_Missa.objects.filter(id__gt=first_proper).values_list('id', flat=True))
+
+    first_suggestion = Suggestion.objects.order_by('-id').values_list('id', flat=True).first() or 0
+    Suggestion.objects.bulk_create(
+        Suggestion(
+            antiphona_missa_id=proper_id,
+            song_name=f"Cantus {proper_id}-{number}",
+            author=f"Auctor {rng.randint(1, 50)}",
+            similarity=rng.randint(0, 1000) / 100,
+        )
+        for proper_id in proper_ids
+        for number in range(suggestions_per_proper)
+    )
+    suggestion_ids = Suggestion.objects.filter(id__gt=first_suggestion).values_list('id', flat=True)
+
+    ChangeLogEntry.objects.bulk_create(
+        ChangeLogEntry(model=model._meta.model_name, object_id=object_id, action=ChangeLogEntry.CREATED)
+        for model, ids in (
+            (Antiphona, antiphona_ids),
+            (Missa, [missa_id for missa_id, _ in missa_rows]),
+            (Antiphona_Missa, proper_ids),
+            (Suggestion, suggestion_ids),
+        )
+        for object_id in ids
+    )
+    return [missa_id for missa_id, _ in missa_rows]
@@ -0,0 +1,82 @@
+"""Signal receivers that feed the change log."""
+
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+
+from antiphona_app.changes import record_change
+from antiphona_app.models import (
+    Antiphona,
+    Antiphona_Missa,
+    ChangeLogEntry,
+    Missa,
+    MissaType,
+    MissaType_AntiphonaType,
+    Suggestion,
+)
+
+
+TRACKED_MODELS = (
+    Antiphona,
+    Missa,
+    Antiphona_Missa,
+    Suggestion,
+    MissaType_AntiphonaType,
+)
+
+
+def log_save(sender, instance, created, raw=False, **kwargs):
+    """Records a creation or update, ignoring fixture loading."""
+    if raw:
+        return
+    record_change(instance, ChangeLogEntry.CREATED if created else ChangeLogEntry.UPDATED)
+
+
+def log_delete(sender, instance, **kwargs):
+    """Records a deletion."""
+    record_change(instance, ChangeLogEntry.DELETED)
+
+
+def log_missa_type_reassignments(sender, instance, **kwargs):
+    """
+    Records the missae a MissaType deletion moves to the default type.
+    SET_DEFAULT updates them with a queryset update, bypassing post_save.
+    """
+    for missa in Missa.objects.filter(missa_type=instance).only('id'):
+        record_change(missa, ChangeLogEntry.UPDATED)
+
+
+def _through_rows(through, instance, model, pk_set):
+    """Returns the through rows linking instance with the objects in pk_set."""
+    filters = {}
+    for field in through._meta.get_fields():
+        if not field.many_to_one:
+            continue
+        if field.related_model is type(instance) and field.name not in filters:
+            filters[field.name] = instance
+        elif field.related_model is model:
+            filters[f"{field.name}__in"] = pk_set
+    return through.objects.filter(**filters)
+
+
+def log_m2m_change(sender, instance, action, model, pk_set, **kwargs):
+    """
+    Records through rows created by the related managers' add(), which
+    uses bulk_create and so bypasses post_save. Removals go through a
+    queryset delete and are already caught by post_delete.
+    """
+    if action == 'post_add':
+        for row in _through_rows(sender, instance, model, pk_set):
+            record_change(row, ChangeLogEntry.CREATED)
+
+
+def connect_signals():
+    """Connects the change log receivers for every tracked model."""
+    for model in TRACKED_MODELS:
+        post_save.connect(log_save, sender=model, dispatch_uid=f"changelog_save_{model._meta.model_name}")
+        post_delete.connect(log_delete, sender=model, dispatch_uid=f"changelog_delete_{model._meta.model_name}")
+    for through in (Missa.antiphonae.through, MissaType.antiphona_types.through):
+        m2m_changed.connect(
+            log_m2m_change,
+            sender=through,
+            dispatch_uid=f"changelog_m2m_{through._meta.model_name}",
+        )
+    pre_delete.connect(log_missa_type_reassignments, sender=MissaType, dispatch_uid="changelog_missa_type_delete")
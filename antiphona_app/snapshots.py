@@ -0,0 +1,242 @@
+"""
+Compact SQLite snapshots of the propers dataset for offline clients.
+
+Every string is interned in a single `strings` table and rows refer to
+it by id, so repeated names (documenta, psalms, authors...) are stored
+once. A snapshot is versioned with the change log sequence it was taken
+at; a delta snapshot holds only the rows changed after a previous
+version, plus the ids deleted since then. Edits to the vocabulary tables
+aren't in the change log, so file names also carry a hash of the content:
+a new name at the same version means the vocabulary changed.
+
+Clients apply a delta by upserting its rows and removing the ids listed
+in its `deleted` table, except for the small vocabulary tables named in
+the `replace_tables` meta entry: those are always written whole, and
+must replace the client's copy.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import tempfile
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import transaction
+
+from antiphona_app.models import (
+    Anno,
+    Antiphona,
+    Antiphona_Missa,
+    AntiphonaType,
+    ChangeLogEntry,
+    Documentum,
+    Missa,
+    MissaType,
+    MissaType_AntiphonaType,
+    Suggestion,
+)
+
+
+FORMAT_VERSION = 1
+FULL = 'full'
+DELTA = 'delta'
+HASH_LENGTH = 12
+FILENAME_RE = re.compile(
+    r'^(?:full|delta-(?P<since>\d+))-(?P<version>\d+)-(?P<content_hash>[0-9a-f]{%d})\.sqlite3$' % HASH_LENGTH
+)
+
+# Columns are (name, field, kind), where kind is 'id' for integers and
+# foreign keys, 'str' for interned strings and 'cents' for decimals.
+Table = namedtuple('Table', ['name', 'model', 'columns', 'tracked'])
+
+TABLES = (
+    Table('anno', Anno, (('name', 'name', 'str'),), False),
+    Table('antiphona_type', AntiphonaType, (('name', 'name', 'str'),), False),
+    Table('documentum', Documentum, (('name', 'name', 'str'),), False),
+    Table('missa_type', MissaType, (('name', 'name', 'str'),), False),
+    Table('missa_type_antiphona_type', MissaType_AntiphonaType, (
+        ('missa_type_id', 'missa_type_id', 'id'),
+        ('antiphona_type_id', 'antiphona_type_id', 'id'),
+        ('ord', 'order', 'id'),
+    ), True),
+    Table('antiphona', Antiphona, (
+        ('name', 'name', 'str'),
+        ('text', 'text', 'str'),
+    ), True),
+    Table('missa', Missa, (
+        ('name', 'name', 'str'),
+        ('missa_type_id', 'missa_type_id', 'id'),
+    ), True),
+    Table('antiphona_missa', Antiphona_Missa, (
+        ('antiphona_id', 'antiphona_id', 'id'),
+        ('missa_id', 'missa_id', 'id'),
+        ('anno_id', 'anno_id', 'id'),
+        ('evangelium', 'evangelium', 'str'),
+        ('antiphona_type_id', 'antiphona_type_id', 'id'),
+        ('documentum_id', 'documentum_id', 'id'),
+        ('psalm', 'psalm', 'str'),
+        ('alt_psalm', 'alt_psalm', 'str'),
+    ), True),
+    Table('suggestion', Suggestion, (
+        ('song_name', 'song_name', 'str'),
+        ('author', 'author', 'str'),
+        ('audio_link', 'audio_link', 'str'),
+        ('sheet_link', 'sheet_link', 'str'),
+        ('similarity', 'similarity', 'cents'),
+        ('antiphona_missa_id', 'antiphona_missa_id', 'id'),
+    ), True),
+)
+
+
+class StringPool:
+    """Interns strings, handing out a stable id for each distinct value."""
+
+    def __init__(self):
+        self.ids = {}
+
+    def intern(self, value):
+        if value is None:
+            return None
+        if value not in self.ids:
+            self.ids[value] = len(self.ids) + 1
+        return self.ids[value]
+
+
+def snapshot_filename(version, content_hash, since=None):
+    """Returns the file name of a full snapshot, or of a delta since a version."""
+    if since is None:
+        return f"full-{version}-{content_hash[:HASH_LENGTH]}.sqlite3"
+    return f"delta-{since}-{version}-{content_hash[:HASH_LENGTH]}.sqlite3"
+
+
+def current_version():
+    """Returns the last change log sequence, which versions the snapshots."""
+    last = ChangeLogEntry.objects.order_by('-sequence').values_list('sequence', flat=True).first()
+    return last or 0
+
+
+def _deleted_ids(since, version):
+    """Returns the (table name, id) deleted, and not created again, in (since, version]."""
+    table_names = {table.model._meta.model_name: table.name for table in TABLES if table.tracked}
+    last_action = {}
+    entries = ChangeLogEntry.objects.filter(sequence__gt=since, sequence__lte=version)
+    for model, object_id, action in entries.values_list('model', 'object_id', 'action'):
+        last_action[(table_names[model], object_id)] = action
+    return [key for key, action in last_action.items() if action == ChangeLogEntry.DELETED]
+
+
+def _encode(value, kind, pool):
+    if kind == 'str':
+        return pool.intern(value)
+    if kind == 'cents':
+        return None if value is None else int(value * 100)
+    return value
+
+
+def _content_hash(pool, rows, deleted):
+    """Returns a SHA-256 hex digest of the data a snapshot holds."""
+    content = json.dumps([list(pool.ids), rows, deleted], separators=(',', ':'))
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def write_snapshot(path, since=None):
+    """
+    Writes a snapshot to path and returns its (version, content hash).
+
+    With `since`, only the tracked rows changed after that version are
+    written; the vocabulary tables are small and always written whole.
+    Raises ValueError if `since` is past the current version.
+    """
+    pool = StringPool()
+    with transaction.atomic():
+        version = current_version()
+        if since is not None and since > version:
+            raise ValueError(f"since {since} is past the current version {version}")
+        deleted = [] if since is None else _deleted_ids(since, version)
+        rows = {}
+        for table in TABLES:
+            queryset = table.model.objects.order_by('id')
+            if since is not None and table.tracked:
+                # a subquery, so the changed ids aren't bound one by one
+                changed = ChangeLogEntry.objects.filter(
+                    model=table.model._meta.model_name, sequence__gt=since, sequence__lte=version,
+                ).values('object_id')
+                queryset = queryset.filter(id__in=changed)
+            fields = ['id'] + [field for _, field, _ in table.columns]
+            rows[table.name] = [
+                [row[0]] + [_encode(value, kind, pool) for value, (_, _, kind) in zip(row[1:], table.columns)]
+                for row in queryset.values_list(*fields)
+            ]
+
+    content_hash = _content_hash(pool, rows, deleted)
+
+    if os.path.exists(path):
+        os.remove(path)
+    connection = sqlite3.connect(path)
+    try:
+        with connection:
+            connection.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            connection.executemany("INSERT INTO meta VALUES (?, ?)", (
+                ('format_version', str(FORMAT_VERSION)),
+                ('kind', FULL if since is None else DELTA),
+                ('base_version', str(since or 0)),
+                ('version', str(version)),
+                ('content_hash', content_hash),
+                ('replace_tables', ','.join(table.name for table in TABLES if not table.tracked)),
+            ))
+            connection.execute("CREATE TABLE strings (id INTEGER PRIMARY KEY, value TEXT NOT NULL)")
+            connection.executemany(
+                "INSERT INTO strings VALUES (?, ?)",
+                ((string_id, value) for value, string_id in pool.ids.items()),
+            )
+            for table in TABLES:
+                columns = ', '.join(f"{name} INTEGER" for name, _, _ in table.columns)
+                connection.execute(f"CREATE TABLE {table.name} (id INTEGER PRIMARY KEY, {columns})")
+                placeholders = ', '.join('?' * (len(table.columns) + 1))
+                connection.executemany(f"INSERT INTO {table.name} VALUES ({placeholders})", rows[table.name])
+            connection.execute("CREATE TABLE deleted (table_name TEXT NOT NULL, object_id INTEGER NOT NULL)")
+            connection.executemany("INSERT INTO deleted VALUES (?, ?)", deleted)
+        connection.execute("VACUUM")
+    finally:
+        connection.close()
+    return version, content_hash
+
+
+def export_snapshot(since=None, directory=None):
+    """Writes a snapshot into the snapshots directory and returns its path."""
+    directory = directory or settings.ANTIPHONA_SNAPSHOT_DIR
+    os.makedirs(directory, exist_ok=True)
+    handle, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=directory)
+    os.close(handle)
+    try:
+        version, content_hash = write_snapshot(tmp_path, since)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+    path = os.path.join(directory, snapshot_filename(version, content_hash, since))
+    os.replace(tmp_path, path)
+    return path
+
+
+def list_snapshots(directory=None):
+    """Returns the snapshots in the snapshots directory, oldest first."""
+    directory = directory or settings.ANTIPHONA_SNAPSHOT_DIR
+    if not os.path.isdir(directory):
+        return []
+    snapshots = []
+    for name in os.listdir(directory):
+        match = FILENAME_RE.match(name)
+        if match:
+            since = match.group('since')
+            snapshots.append({
+                "name": name,
+                "kind": FULL if since is None else DELTA,
+                "base_version": int(since or 0),
+                "version": int(match.group('version')),
+                "content_hash": match.group('content_hash'),
+                "size": os.path.getsize(os.path.join(directory, name)),
+            })
+    return sorted(snapshots, key=lambda snapshot: (snapshot["version"], snapshot["base_version"]))
@@ -0,0 +1,64 @@
+"""Factory helpers to build test data with sensible defaults."""
+
+from antiphona_app.models import (
+    Antiphona,
+    Antiphona_Missa,
+    AntiphonaType,
+    Documentum,
+    Missa,
+    MissaType,
+    Suggestion,
+)
+from antiphona_app.seed import seed_propers
+
+
+AD_TE_LEVAVI = (
+    "Ad te levavi animam meam : "
+    "Deus meus in te confido, non erubescam : "
+    "neque irrideant me inimicimei : "
+    "etenim universi qui te exspectant, non confundentur."
+)
+
+
+def make_antiphona(**kwargs):
+    """Creates an Antiphona, Ad te levavi by default."""
+    kwargs.setdefault("name", "Ad te levavi")
+    kwargs.setdefault("text", AD_TE_LEVAVI)
+    return Antiphona.objects.create(**kwargs)
+
+
+def make_missa(**kwargs):
+    """Creates a Dominica Missa."""
+    kwargs.setdefault("name", "Dominica I Adventus")
+    if "missa_type" not in kwargs:
+        kwargs["missa_type"] = MissaType.objects.get(name="Dominica")
+    return Missa.objects.create(**kwargs)
+
+
+def make_antiphona_missa(**kwargs):
+    """Creates an Antiphona_Missa, making its Antiphona and Missa if not given."""
+    if "antiphona" not in kwargs:
+        kwargs["antiphona"] = make_antiphona()
+    if "missa" not in kwargs:
+        kwargs["missa"] = make_missa()
+    if "antiphona_type" not in kwargs:
+        kwargs["antiphona_type"] = AntiphonaType.objects.get(name="Introito")
+    if "documentum" not in kwargs:
+        kwargs["documentum"] = Documentum.objects.get(name="Graduale Romanum")
+    kwargs.setdefault("psalm", "Ps. 24, 4")
+    return Antiphona_Missa.objects.create(**kwargs)
+
+
+def make_suggestion(**kwargs):
+    """Creates a Suggestion, making its Antiphona_Missa if not given."""
+    if "antiphona_missa" not in kwargs:
+        kwargs["antiphona_missa"] = make_antiphona_missa()
+    kwargs.setdefault("song_name", "Ad te levavi")
+    kwargs.setdefault("author", "Gregorian (Liber Usualis)")
+    kwargs.setdefault("similarity", 10)
+    return Suggestion.objects.create(**kwargs)
+
+
+def make_dataset(missae=100, antiphonae=200, suggestions_per_proper=1, seed=0):
+    """Bulk creates a large dataset of full missae and returns their ids."""
+    return seed_propers(missae, antiphonae, suggestions_per_proper, seed)
@@ -0,0 +1,179 @@
+"""Tests for the change-data feed."""
+
+import json
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from antiphona_app.changes import changes_since
+from antiphona_app.models import (
+    Antiphona,
+    Antiphona_Missa,
+    AntiphonaType,
+    ChangeLogEntry,
+    Documentum,
+    Missa,
+    MissaType,
+    MissaType_AntiphonaType,
+)
+
+
+class ChangeLogTests(TestCase):
+    """Tests for the signals populating the change log"""
+
+    def setUp(self):
+        self.missa_type = MissaType.objects.get(name="Dominica")
+        self.antiphona_type = AntiphonaType.objects.get(name="Introito")
+        self.documentum = Documentum.objects.get(name="Graduale Romanum")
+        self.antiphona = Antiphona.objects.create(name="Ad te levavi", text="Ad te levavi animam meam")
+        self.missa = Missa.objects.create(name="Dominica I Adventus", missa_type=self.missa_type)
+
+    def test_create_is_logged(self):
+        """Creations are logged in order"""
+        self.assertEqual(
+            [(e.model, e.object_id, e.action) for e in ChangeLogEntry.objects.all()],
+            [
+                ("antiphona", self.antiphona.id, ChangeLogEntry.CREATED),
+                ("missa", self.missa.id, ChangeLogEntry.CREATED),
+            ],
+        )
+
+    def test_update_and_delete_are_logged(self):
+        """Updates and deletions are logged"""
+        self.antiphona.name = "Ad te Domine levavi"
+        self.antiphona.save()
+        antiphona_id = self.antiphona.id
+        self.antiphona.delete()
+        self.assertEqual(
+            [(e.object_id, e.action) for e in ChangeLogEntry.objects.filter(model="antiphona")],
+            [
+                (antiphona_id, ChangeLogEntry.CREATED),
+                (antiphona_id, ChangeLogEntry.UPDATED),
+                (antiphona_id, ChangeLogEntry.DELETED),
+            ],
+        )
+
+    def test_cascade_delete_is_logged(self):
+        """Rows deleted by cascade are logged"""
+        antiphona_missa = Antiphona_Missa.objects.create(
+            antiphona=self.antiphona,
+            missa=self.missa,
+            antiphona_type=self.antiphona_type,
+            documentum=self.documentum,
+        )
+        self.missa.delete()
+        self.assertTrue(ChangeLogEntry.objects.filter(
+            model="antiphona_missa",
+            object_id=antiphona_missa.id,
+            action=ChangeLogEntry.DELETED,
+        ).exists())
+
+    def test_m2m_add_and_remove_are_logged(self):
+        """Through rows written by the related managers are logged"""
+        missa_type = MissaType.objects.create(name="Vigilia Paschalis")
+        missa_type.antiphona_types.add(self.antiphona_type, through_defaults={"order": 1})
+        link = MissaType_AntiphonaType.objects.get(missa_type=missa_type)
+        missa_type.antiphona_types.remove(self.antiphona_type)
+        self.assertEqual(
+            [e.action for e in ChangeLogEntry.objects.filter(model="missatype_antiphonatype", object_id=link.id)],
+            [ChangeLogEntry.CREATED, ChangeLogEntry.DELETED],
+        )
+
+    def test_missa_type_deletion_logs_reassigned_missae(self):
+        """Missae moved to the default type when theirs is deleted are logged"""
+        missa_type = MissaType.objects.create(name="Vigilia Paschalis")
+        missa = Missa.objects.create(name="Vigilia Paschalis in Nocte Sancta", missa_type=missa_type)
+        last = ChangeLogEntry.objects.last().sequence
+        missa_type.delete()
+        self.assertEqual(
+            [(e.model, e.object_id, e.action) for e in ChangeLogEntry.objects.filter(sequence__gt=last)],
+            [("missa", missa.id, ChangeLogEntry.UPDATED)],
+        )
+
+    def test_sequence_is_monotonic(self):
+        """Sequence numbers always increase"""
+        for number in range(5):
+            Antiphona.objects.create(name=f"Antiphona {number}", text="")
+        sequences = list(ChangeLogEntry.objects.values_list("sequence", flat=True))
+        self.assertEqual(sequences, sorted(set(sequences)))
+
+    def test_changes_since_pagination(self):
+        """changes_since pages through the log until up to date"""
+        first = ChangeLogEntry.objects.first()
+        entries, next_since, has_more = changes_since(0, 1)
+        self.assertEqual(entries, [first])
+        self.assertEqual(next_since, first.sequence)
+        self.assertTrue(has_more)
+        entries, next_since, has_more = changes_since(next_since, 1)
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(next_since, entries[0].sequence)
+        self.assertFalse(has_more)
+
+    def test_changes_since_keeps_cursor_when_up_to_date(self):
+        """An empty page hands back the same cursor"""
+        last = ChangeLogEntry.objects.last().sequence
+        self.assertEqual(changes_since(last), ([], last, False))
+
+
+class ChangesFeedTests(TestCase):
+    """Tests for the changes API and management command"""
+
+    def setUp(self):
+        self.antiphonae = [
+            Antiphona.objects.create(name=f"Antiphona {number}", text="") for number in range(3)
+        ]
+        self.sequences = list(ChangeLogEntry.objects.values_list("sequence", flat=True))
+
+    def test_api_changes_since(self):
+        """API returns the changes after `since`"""
+        response = self.client.get(reverse("changes"), {"since": self.sequences[0], "limit": 1})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([r["sequence"] for r in data["results"]], [self.sequences[1]])
+        self.assertEqual(data["next_since"], self.sequences[1])
+        self.assertTrue(data["has_more"])
+
+    def test_api_up_to_date(self):
+        """API hands back the same cursor once up to date"""
+        data = self.client.get(reverse("changes"), {"since": self.sequences[-1]}).json()
+        self.assertEqual(data["results"], [])
+        self.assertEqual(data["next_since"], self.sequences[-1])
+        self.assertFalse(data["has_more"])
+
+    def test_api_invalid_parameters(self):
+        """API rejects invalid parameters"""
+        response = self.client.get(reverse("changes"), {"since": "abc"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_command_follows_all_pages(self):
+        """Management command prints every page with --all"""
+        out = StringIO()
+        call_command("changes_since", "0", "--limit", "1", "--all", stdout=out)
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([line["sequence"] for line in lines], self.sequences)
+
+
+class ChangeLogAdminTests(TestCase):
+    """Tests for the read-only change log admin"""
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser("admin", "admin@example.com", "admin"))
+        Antiphona.objects.create(name="Ad te levavi", text="")
+        self.entry = ChangeLogEntry.objects.get()
+
+    def test_changelist_is_browsable(self):
+        """Superusers can browse the log"""
+        response = self.client.get(reverse("admin:antiphona_app_changelogentry_changelist"))
+        self.assertEqual(response.status_code, 200)
+
+    def test_entries_cannot_be_deleted(self):
+        """Not even superusers can delete entries"""
+        response = self.client.post(
+            reverse("admin:antiphona_app_changelogentry_delete", args=[self.entry.sequence]),
+            {"post": "yes"},
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertTrue(ChangeLogEntry.objects.filter(sequence=self.entry.sequence).exists())
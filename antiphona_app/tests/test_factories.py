@@ -0,0 +1,24 @@
+"""Tests for the test data factories."""
+
+from django.test import TestCase
+
+from antiphona_app.missa_templates import validate_missae
+from antiphona_app.models import Missa, Suggestion
+from antiphona_app.tests.factories import make_dataset, make_suggestion
+
+
+class FactoryTests(TestCase):
+    """Tests for the factory helpers"""
+
+    def test_make_suggestion_builds_its_parents(self):
+        """A suggestion alone gets a full Antiphona_Missa chain"""
+        suggestion = make_suggestion()
+        self.assertEqual(str(suggestion.antiphona_missa), "Dominica I Adventus - Ad te levavi")
+
+    def test_make_dataset_fills_every_slot(self):
+        """Dataset missae have their propers complete"""
+        missa_ids = make_dataset(missae=20, antiphonae=10, suggestions_per_proper=2)
+        reports = validate_missae(Missa.objects.filter(id__in=missa_ids))
+        self.assertEqual(len(reports), 20)
+        self.assertFalse(any(report.missing or report.extra for report in reports))
+        self.assertEqual(Suggestion.objects.count(), 20 * 3 * 2)
@@ -0,0 +1,85 @@
+"""Tests for the load-testing harness."""
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+
+from Antiphona.wsgi import application
+from antiphona_app import loadtest
+from antiphona_app.tests.factories import make_dataset
+
+
+class LoadTestHelpersTests(SimpleTestCase):
+    """Tests for the plan and summary helpers"""
+
+    def setUp(self):
+        self.endpoints = (
+            loadtest.Endpoint('heavy', 9, lambda rng: '/heavy/'),
+            loadtest.Endpoint('light', 1, lambda rng: f'/light/{rng.randint(1, 5)}/'),
+        )
+
+    def test_plan_is_reproducible(self):
+        """The same seed gives the same plan"""
+        self.assertEqual(
+            loadtest.build_plan(self.endpoints, 50, seed=1),
+            loadtest.build_plan(self.endpoints, 50, seed=1),
+        )
+
+    def test_plan_follows_weights(self):
+        """Heavier endpoints get more requests"""
+        plan = loadtest.build_plan(self.endpoints, 1000)
+        self.assertGreater(sum(name == 'heavy' for name, _, _ in plan), 800)
+
+    def test_percentile(self):
+        """Nearest-rank percentiles"""
+        values = list(range(1, 101))
+        self.assertEqual(loadtest.percentile(values, 0.50), 50)
+        self.assertEqual(loadtest.percentile(values, 0.99), 99)
+        self.assertEqual(loadtest.percentile([], 0.99), 0)
+
+    def test_listen_backlog_fits_concurrency(self):
+        """The server never queues connects beyond its listen backlog"""
+        for concurrency in (1, 10, 500):
+            self.assertGreaterEqual(loadtest._server_class(concurrency).request_queue_size, concurrency)
+
+    def test_summarize(self):
+        """Summary per endpoint and in total"""
+        results = [
+            loadtest.Result('heavy', 0.010, True),
+            loadtest.Result('heavy', 0.030, False),
+            loadtest.Result('light', 0.020, True),
+        ]
+        summary = loadtest.summarize(results, elapsed=1)
+        self.assertEqual(summary['heavy']['requests'], 2)
+        self.assertEqual(summary['heavy']['error_rate'], 0.5)
+        self.assertEqual(summary['total']['throughput'], 3)
+        self.assertIn('total', loadtest.format_summary(summary).splitlines()[-1])
+
+
+@override_settings(ALLOWED_HOSTS=['127.0.0.1'], ANTIPHONA_RATE_LIMIT=(10 ** 9, 10 ** 9))
+class LoadTestRunTests(TransactionTestCase):
+    """Smoke test replaying a small plan against the WSGI application"""
+
+    fixtures = ['vocabulary']
+
+    def test_run_wsgi(self):
+        """Every request in the plan gets through"""
+        cache.clear()
+        missa_ids = make_dataset(missae=5, antiphonae=10, seed=1)
+        endpoints = loadtest.request_mix(missa_ids, 1, loadtest.admin_session_headers())
+        plan = loadtest.build_plan(endpoints, 40)
+        results, elapsed = loadtest.run_wsgi(application, plan, concurrency=4)
+        self.assertEqual(len(results), 40)
+        self.assertTrue(all(result.ok for result in results))
+        self.assertIn('admin missae', {result.endpoint for result in results})
+        self.assertGreater(elapsed, 0)
+
+    def test_run_wsgi_counts_every_failure(self):
+        """Requests failing in any way, like a truncated body, are counted as errors"""
+        def broken(environ, start_response):
+            start_response('200 OK', [('Content-Length', '100')])
+            return [b'truncated']
+
+        plan = [('broken', '/', {})] * 5
+        results, _ = loadtest.run_wsgi(broken, plan, concurrency=2)
+        self.assertEqual(len(results), 5)
+        self.assertFalse(any(result.ok for result in results))
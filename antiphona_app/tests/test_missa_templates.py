@@ -0,0 +1,84 @@
+"""Tests for the in-memory MissaType templates."""
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from antiphona_app.missa_templates import load_templates, validate_missae
+from antiphona_app.models import AntiphonaType, Missa, MissaType
+from antiphona_app.tests.factories import make_antiphona, make_antiphona_missa, make_missa
+
+
+class MissaTemplateTests(TestCase):
+    """Tests for loading the templates and validating missae"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.dominica = MissaType.objects.get(name="Dominica")
+        cls.types = {t.name: t for t in AntiphonaType.objects.all()}
+        cls.baptismal = AntiphonaType.objects.create(name="Liturgiam Baptismalem")
+        antiphona = make_antiphona()
+
+        cls.complete = make_missa(name="Dominica I Adventus")
+        for name in ("Introito", "Offertorium", "Communio"):
+            make_antiphona_missa(antiphona=antiphona, missa=cls.complete, antiphona_type=cls.types[name])
+        cls.incomplete = make_missa(name="Dominica II Adventus")
+        for antiphona_type in (cls.types["Introito"], cls.baptismal):
+            make_antiphona_missa(antiphona=antiphona, missa=cls.incomplete, antiphona_type=antiphona_type)
+
+    def test_templates_are_ordered(self):
+        """Template slots follow the MissaType_AntiphonaType order"""
+        template = load_templates()[self.dominica.id]
+        self.assertEqual(
+            [slot.antiphona_type_name for slot in template.slots],
+            ["Introito", "Offertorium", "Communio"],
+        )
+
+    def test_templates_are_read_only(self):
+        """Templates can't be modified"""
+        templates = load_templates()
+        with self.assertRaises(TypeError):
+            templates[self.dominica.id] = None
+
+    def test_validate_complete_missa(self):
+        """A Missa filling every slot has nothing missing nor extra"""
+        report, = validate_missae(Missa.objects.filter(id=self.complete.id))
+        self.assertEqual((report.missing, report.extra), ((), ()))
+
+    def test_validate_incomplete_missa(self):
+        """Missing and extra propers are reported"""
+        report, = validate_missae(Missa.objects.filter(id=self.incomplete.id))
+        self.assertEqual(report.missing, ("Offertorium", "Communio"))
+        self.assertEqual(report.extra, ("Liturgiam Baptismalem",))
+
+    def test_validate_sliced_queryset(self):
+        """Sliced querysets are accepted"""
+        report, = validate_missae(Missa.objects.order_by("-id")[:1])
+        self.assertEqual(report.missa_id, self.incomplete.id)
+
+    def test_validate_query_count(self):
+        """Validation doesn't issue queries per Missa"""
+        for number in range(10):
+            make_missa(name=f"Feria {number}")
+        templates = load_templates()
+        with self.assertNumQueries(2):
+            reports = validate_missae(templates=templates)
+        self.assertEqual(len(reports), 12)
+
+    def test_validate_filters_with_subquery(self):
+        """Missa ids aren't bound one by one, so a whole year fits in a query"""
+        with CaptureQueriesContext(connection) as queries:
+            validate_missae(Missa.objects.filter(missa_type=self.dominica))
+        self.assertIn("IN (SELECT", queries[-1]["sql"])
+
+    def test_check_propers_command(self):
+        """Management command reports only the incomplete missae"""
+        out = StringIO()
+        call_command("check_propers", stdout=out)
+        output = out.getvalue()
+        self.assertIn("Dominica II Adventus", output)
+        self.assertNotIn("Dominica I Adventus", output)
+        self.assertIn("1 of 2 missae", output)
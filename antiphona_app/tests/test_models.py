@@ -19,14 +19,15 @@ from antiphona_app.models import (
 class AntiphonaTests(TestCase):
     """Tests for the Antiphona class"""
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         # types gets
-        self.missa_type = MissaType.objects.get(name="Dominica")
-        self.antiphona_type = AntiphonaType.objects.get(name='Introito')
-        self.documentum = Documentum.objects.get(name='Graduale Romanum')
+        cls.missa_type = MissaType.objects.get(name="Dominica")
+        cls.antiphona_type = AntiphonaType.objects.get(name='Introito')
+        cls.documentum = Documentum.objects.get(name='Graduale Romanum')
 
         # real creations
-        self.antiphona_attributes = {
+        cls.antiphona_attributes = {
             "name": "Ad te levavi",
             "text": (
                 "Ad te levavi animam meam : "
@@ -35,27 +36,27 @@ class AntiphonaTests(TestCase):
                 "etenim universi qui te exspectant, non confundentur."
             ),
         }
-        self.pre_antiphona = Antiphona.objects.create(**self.antiphona_attributes)
-        self.missa_attributes = {
+        cls.pre_antiphona = Antiphona.objects.create(**cls.antiphona_attributes)
+        cls.missa_attributes = {
             "name": "Dominica I Adventus",
-            "missa_type": self.missa_type,
+            "missa_type": cls.missa_type,
         }
-        self.missa = Missa.objects.create(**self.missa_attributes)
-        self.antiphona_missa_attributes = {
-            "antiphona": self.pre_antiphona,
-            "missa": self.missa,
+        cls.missa = Missa.objects.create(**cls.missa_attributes)
+        cls.antiphona_missa_attributes = {
+            "antiphona": cls.pre_antiphona,
+            "missa": cls.missa,
             "anno": None,
             "evangelium": None,
-            "antiphona_type": self.antiphona_type,
-            "documentum": self.documentum,
+            "antiphona_type": cls.antiphona_type,
+            "documentum": cls.documentum,
             "psalm": "Ps. 24, 4",
             "alt_psalm": "",
         }
-        self.pre_antiphona_missa = Antiphona_Missa.objects.create(**self.antiphona_missa_attributes)
+        cls.pre_antiphona_missa = Antiphona_Missa.objects.create(**cls.antiphona_missa_attributes)
 
         # get after creation
-        self.antiphona = Antiphona.objects.get(id=self.pre_antiphona.id)
-        self.antiphona_missa = self.antiphona.antiphona_missa_set.first()
+        cls.antiphona = Antiphona.objects.get(id=cls.pre_antiphona.id)
+        cls.antiphona_missa = cls.antiphona.antiphona_missa_set.first()
 
     @parameterized.expand([
         ("name",),
@@ -93,15 +94,16 @@ class AntiphonaTests(TestCase):
 class MissaTests(TestCase):
     """Tests for the Missa class"""
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         # basic types and names
-        self.missa_type = MissaType.objects.get(name="Dominica")
-        self.antiphona_type_names = ['Introito', 'Offertorium', 'Communio']
-        self.antiphona_type = AntiphonaType.objects.get(name='Introito')
-        self.documentum = Documentum.objects.get(name='Graduale Romanum')
+        cls.missa_type = MissaType.objects.get(name="Dominica")
+        cls.antiphona_type_names = ['Introito', 'Offertorium', 'Communio']
+        cls.antiphona_type = AntiphonaType.objects.get(name='Introito')
+        cls.documentum = Documentum.objects.get(name='Graduale Romanum')
 
         # real creations
-        self.antiphona_attributes = {
+        cls.antiphona_attributes = {
             "name": "Ad te levavi",
             "text": (
                 "Ad te levavi animam meam : "
@@ -110,28 +112,28 @@ class MissaTests(TestCase):
                 "etenim universi qui te exspectant, non confundentur."
             ),
         }
-        self.antiphona = Antiphona.objects.create(**self.antiphona_attributes)
-        self.missa_attributes = {
+        cls.antiphona = Antiphona.objects.create(**cls.antiphona_attributes)
+        cls.missa_attributes = {
             "name": "Dominica I Adventus",
-            "missa_type": self.missa_type,
+            "missa_type": cls.missa_type,
         }
-        self.pre_missa = Missa.objects.create(**self.missa_attributes)
-        self.antiphona_missa_attributes = {
-            "antiphona": self.antiphona,
-            "missa": self.pre_missa,
+        cls.pre_missa = Missa.objects.create(**cls.missa_attributes)
+        cls.antiphona_missa_attributes = {
+            "antiphona": cls.antiphona,
+            "missa": cls.pre_missa,
             "anno": None,
             "evangelium": None,
-            "antiphona_type": self.antiphona_type,
-            "documentum": self.documentum,
+            "antiphona_type": cls.antiphona_type,
+            "documentum": cls.documentum,
             "psalm": "Ps. 24, 4",
             "alt_psalm": "",
 
         }
-        self.pre_antiphona_missa = Antiphona_Missa.objects.create(**self.antiphona_missa_attributes)
+        cls.pre_antiphona_missa = Antiphona_Missa.objects.create(**cls.antiphona_missa_attributes)
 
         # get after creation
-        self.missa = Missa.objects.get(id=self.pre_missa.id)
-        self.antiphona_missa = self.missa.antiphona_missa_set.first()
+        cls.missa = Missa.objects.get(id=cls.pre_missa.id)
+        cls.antiphona_missa = cls.missa.antiphona_missa_set.first()
 
     def test_saved_missa_name(self):
         """Missa name saved properly"""
@@ -177,15 +179,16 @@ class MissaTests(TestCase):
 class StrTests(TestCase):
     """This tests the __str__ overriding from the models"""
 
-    def setUp(self):
-        self.anno = Anno.objects.get(name="A")
-        self.antiphona_type = AntiphonaType.objects.get(name="Introito")
-        self.missa_type = MissaType.get_default_missa_type()
-        self.missa = Missa.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        cls.anno = Anno.objects.get(name="A")
+        cls.antiphona_type = AntiphonaType.objects.get(name="Introito")
+        cls.missa_type = MissaType.get_default_missa_type()
+        cls.missa = Missa.objects.create(
             name="Dominica I Adventus",
-            missa_type=self.missa_type,
+            missa_type=cls.missa_type,
         )
-        self.antiphona = Antiphona.objects.create(
+        cls.antiphona = Antiphona.objects.create(
             name="Ad te levavi",
             text=(
                 "Ad te levavi animam meam : "
@@ -194,19 +197,19 @@ class StrTests(TestCase):
                 "etenim universi qui te exspectant, non confundentur."
             ),
         )
-        self.documentum = Documentum.objects.get(name="Graduale Romanum")
-        self.antiphona_missa = Antiphona_Missa.objects.create(
-            antiphona=self.antiphona,
-            missa=self.missa,
-            anno=self.anno,
+        cls.documentum = Documentum.objects.get(name="Graduale Romanum")
+        cls.antiphona_missa = Antiphona_Missa.objects.create(
+            antiphona=cls.antiphona,
+            missa=cls.missa,
+            anno=cls.anno,
             evangelium="",
-            antiphona_type=self.antiphona_type,
-            documentum=self.documentum,
+            antiphona_type=cls.antiphona_type,
+            documentum=cls.documentum,
             psalm="Ps. 24, 4",
             alt_psalm="",
         )
-        self.suggestion = Suggestion.objects.create(
-            antiphona_missa=self.antiphona_missa,
+        cls.suggestion = Suggestion.objects.create(
+            antiphona_missa=cls.antiphona_missa,
             song_name="Ad te levavi",
             author="Gregorian (Liber Usualis)",
             audio_link="https://www.youtube.com/watch?v=VC4Bg3HlMys",
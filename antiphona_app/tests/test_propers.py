@@ -0,0 +1,60 @@
+"""Tests for the propers value read path."""
+
+from django.test import TestCase
+
+from antiphona_app.benchmarks import compare_propers_loading, load_propers_as_models
+from antiphona_app.models import Missa
+from antiphona_app.propers import load_propers
+from antiphona_app.tests.factories import make_dataset
+
+
+class LoadPropersTests(TestCase):
+    """Tests for load_propers"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.missa_ids = make_dataset(missae=10, antiphonae=5, suggestions_per_proper=2)
+        cls.missae = Missa.objects.filter(id__in=cls.missa_ids)
+
+    def test_matches_model_instances(self):
+        """Values carry the same data as the model instances"""
+        values = load_propers(self.missae)
+        models = load_propers_as_models(self.missae)
+        self.assertEqual(set(values), set(models))
+        for missa_id, propers in models.items():
+            self.assertEqual(
+                [
+                    (p.id, p.antiphona.text, p.antiphona_type.name, p.anno.name if p.anno else None, p.psalm)
+                    for p in propers
+                ],
+                [(p.id, p.text, p.antiphona_type, p.anno, p.psalm) for p in values[missa_id]],
+            )
+            self.assertEqual(
+                [[s.id for s in p.suggestion_set.all()] for p in propers],
+                [[s.id for s in p.suggestions] for p in values[missa_id]],
+            )
+
+    def test_strings_are_shared(self):
+        """Equal strings are the same object across values"""
+        texts = {}
+        for propers in load_propers(self.missae).values():
+            for proper in propers:
+                self.assertIs(texts.setdefault(proper.text, proper.text), proper.text)
+
+    def test_query_count(self):
+        """Two queries however many missae"""
+        with self.assertNumQueries(2):
+            load_propers(self.missae)
+
+    def test_values_have_no_instance_dict(self):
+        """Values are plain tuples, without per instance attributes"""
+        proper = load_propers(self.missae.filter(id=self.missa_ids[0]))[self.missa_ids[0]][0]
+        self.assertFalse(hasattr(proper, '__dict__'))
+
+    def test_compare_propers_loading(self):
+        """Benchmark reports time and memory for both paths"""
+        results = compare_propers_loading(self.missae, repeat=1)
+        self.assertEqual(set(results), {"models", "values"})
+        for seconds, peak in results.values():
+            self.assertGreater(seconds, 0)
+            self.assertGreater(peak, 0)
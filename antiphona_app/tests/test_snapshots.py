@@ -0,0 +1,177 @@
+"""Tests for the offline snapshots."""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from antiphona_app.models import (
+    Antiphona,
+    Antiphona_Missa,
+    AntiphonaType,
+    Documentum,
+    Missa,
+    MissaType,
+    MissaType_AntiphonaType,
+    Suggestion,
+)
+from antiphona_app.snapshots import current_version, export_snapshot, list_snapshots, snapshot_filename
+
+
+class SnapshotTests(TestCase):
+    """Tests for exporting and serving snapshots"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.settings_override = override_settings(ANTIPHONA_SNAPSHOT_DIR=self.directory)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+        self.missa = Missa.objects.create(name="Dominica I Adventus", missa_type=MissaType.objects.get(name="Dominica"))
+        self.antiphona = Antiphona.objects.create(name="Ad te levavi", text="Ad te levavi animam meam")
+        self.antiphona_missa = Antiphona_Missa.objects.create(
+            antiphona=self.antiphona,
+            missa=self.missa,
+            antiphona_type=AntiphonaType.objects.get(name="Introito"),
+            documentum=Documentum.objects.get(name="Graduale Romanum"),
+            psalm="Ps. 24, 4",
+        )
+        self.suggestion = Suggestion.objects.create(
+            antiphona_missa=self.antiphona_missa,
+            song_name="Ad te levavi",
+            author="Gregorian",
+            similarity=9.5,
+        )
+
+    def content_hash(self, path):
+        return self.query(path, "SELECT value FROM meta WHERE key = 'content_hash'")[0][0]
+
+    def query(self, path, sql):
+        connection = sqlite3.connect(path)
+        try:
+            return connection.execute(sql).fetchall()
+        finally:
+            connection.close()
+
+    def test_full_snapshot(self):
+        """A full snapshot holds every row, with interned strings"""
+        path = export_snapshot()
+        self.assertEqual(os.path.basename(path), snapshot_filename(current_version(), self.content_hash(path)))
+        self.assertEqual(
+            self.query(path, "SELECT s.value FROM antiphona a JOIN strings s ON s.id = a.name"),
+            [("Ad te levavi",)],
+        )
+        # the same string is stored once
+        self.assertEqual(self.query(path, "SELECT COUNT(*) FROM strings WHERE value = 'Ad te levavi'"), [(1,)])
+        self.assertEqual(self.query(path, "SELECT similarity FROM suggestion"), [(950,)])
+        self.assertEqual(self.query(path, "SELECT COUNT(*) FROM documentum"), [(3,)])
+        self.assertEqual(self.query(path, "SELECT value FROM meta WHERE key = 'kind'"), [("full",)])
+
+    def test_delta_snapshot(self):
+        """A delta holds only the changed rows and the deletions"""
+        since = current_version()
+        new_antiphona = Antiphona.objects.create(name="Rorate caeli", text="Rorate caeli desuper")
+        suggestion_id = self.suggestion.id
+        self.suggestion.delete()
+
+        path = export_snapshot(since)
+        self.assertEqual(
+            os.path.basename(path), snapshot_filename(current_version(), self.content_hash(path), since),
+        )
+        self.assertEqual(self.query(path, "SELECT id FROM antiphona"), [(new_antiphona.id,)])
+        self.assertEqual(self.query(path, "SELECT COUNT(*) FROM missa"), [(0,)])
+        self.assertEqual(self.query(path, "SELECT table_name, object_id FROM deleted"), [("suggestion", suggestion_id)])
+
+    def test_vocabulary_edit_changes_the_name(self):
+        """Unlogged vocabulary edits give a new snapshot at the same version"""
+        first = export_snapshot()
+        self.assertEqual(export_snapshot(), first)
+        Documentum.objects.filter(name="Graduale Simplex").update(name="Graduale Simplex 1975")
+        second = export_snapshot()
+        self.assertNotEqual(second, first)
+        self.assertTrue(os.path.isfile(first))
+        self.assertEqual(
+            [snapshot["version"] for snapshot in list_snapshots()],
+            [current_version(), current_version()],
+        )
+
+    def test_delta_deletions_name_snapshot_tables(self):
+        """Deletions refer to the snapshot's table names"""
+        missa_type = MissaType.objects.create(name="Vigilia Paschalis")
+        missa_type.antiphona_types.add(AntiphonaType.objects.get(name="Introito"), through_defaults={"order": 1})
+        link_id = MissaType_AntiphonaType.objects.get(missa_type=missa_type).id
+        since = current_version()
+        MissaType_AntiphonaType.objects.filter(id=link_id).delete()
+
+        path = export_snapshot(since)
+        self.assertEqual(
+            self.query(path, "SELECT table_name, object_id FROM deleted"),
+            [("missa_type_antiphona_type", link_id)],
+        )
+        self.assertEqual(self.query(path, "SELECT COUNT(*) FROM missa_type_antiphona_type"), [(0,)])
+
+    def test_vocabulary_tables_are_flagged_for_replacement(self):
+        """Vocabulary tables are listed as to be replaced whole"""
+        path = export_snapshot(current_version())
+        self.assertEqual(
+            self.query(path, "SELECT value FROM meta WHERE key = 'replace_tables'"),
+            [("anno,antiphona_type,documentum,missa_type",)],
+        )
+
+    def test_since_past_current_version(self):
+        """Deltas since a future version are refused"""
+        since = current_version() + 1
+        with self.assertRaises(ValueError):
+            export_snapshot(since)
+        with self.assertRaises(CommandError):
+            call_command("export_snapshot", "--since", str(since), stdout=StringIO())
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_command(self):
+        """Management command writes a snapshot and prints its path"""
+        out = StringIO()
+        call_command("export_snapshot", stdout=out)
+        self.assertTrue(os.path.isfile(out.getvalue().strip()))
+
+    def test_list_and_download(self):
+        """Snapshots are listed and downloadable"""
+        name = os.path.basename(export_snapshot())
+        listing = self.client.get(reverse("snapshots")).json()["results"]
+        self.assertEqual([snapshot["name"] for snapshot in listing], [name])
+        response = self.client.get(reverse("snapshot-file", args=[name]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertEqual(b"".join(response.streaming_content)[:15], b"SQLite format 3")
+
+    def test_range_request(self):
+        """Byte ranges are served partially"""
+        path = export_snapshot()
+        name = os.path.basename(path)
+        size = os.path.getsize(path)
+        response = self.client.get(reverse("snapshot-file", args=[name]), HTTP_RANGE="bytes=0-5")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.content, b"SQLite")
+        self.assertEqual(response["Content-Range"], f"bytes 0-5/{size}")
+        response = self.client.get(reverse("snapshot-file", args=[name]), HTTP_RANGE="bytes=-10")
+        self.assertEqual(len(response.content), 10)
+        response = self.client.get(reverse("snapshot-file", args=[name]), HTTP_RANGE=f"bytes={size}-")
+        self.assertEqual(response.status_code, 416)
+
+    def test_head_request(self):
+        """HEAD tells the size and range support before downloading"""
+        path = export_snapshot()
+        response = self.client.head(reverse("snapshot-file", args=[os.path.basename(path)]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(int(response["Content-Length"]), os.path.getsize(path))
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+
+    def test_unknown_snapshot(self):
+        """Unknown or malformed names answer 404"""
+        for name in ("full-999-0123456789ab.sqlite3", "full-999.sqlite3", "..%2Fdb.sqlite3", "db.sqlite3"):
+            self.assertEqual(self.client.get(f"/snapshots/{name}").status_code, 404)
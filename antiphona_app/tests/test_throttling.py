@@ -0,0 +1,168 @@
+"""Tests for request coalescing, rate limiting and the propers endpoint."""
+
+import threading
+import time
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from antiphona_app.models import AntiphonaType, Documentum, MissaType
+from antiphona_app.tests.factories import make_antiphona, make_antiphona_missa, make_missa, make_suggestion
+from antiphona_app.throttling import TokenBucket, single_flight
+
+
+class SingleFlightTests(SimpleTestCase):
+    """Tests for single_flight"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_concurrent_callers_compute_once(self):
+        """Only one of many concurrent callers computes the value"""
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return "propers"
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(single_flight("key", compute)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["propers"] * 5)
+
+    def test_lock_released_on_error(self):
+        """A failing computation doesn't keep the lock"""
+        def fail():
+            raise ValueError
+
+        with self.assertRaises(ValueError):
+            single_flight("key", fail)
+        self.assertEqual(single_flight("key", lambda: "propers", wait=0), "propers")
+
+    def test_keeps_lock_taken_over_by_another_worker(self):
+        """A holder whose lock expired doesn't release the new holder's lock"""
+        def compute():
+            # the lock expired and another worker took it meanwhile
+            cache.set("key:lock", "other worker")
+            return "propers"
+
+        single_flight("key", compute)
+        self.assertEqual(cache.get("key:lock"), "other worker")
+
+    def test_waiter_computes_after_timeout(self):
+        """A caller computes the value itself if the lock holder takes too long"""
+        cache.add("key:lock", 1)
+        self.assertEqual(single_flight("key", lambda: "propers", wait=0.1), "propers")
+
+
+class TokenBucketTests(SimpleTestCase):
+    """Tests for TokenBucket"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_capacity_then_limited(self):
+        """A client may burst up to the capacity, then has to wait"""
+        bucket = TokenBucket(rate=1, capacity=3)
+        self.assertEqual([bucket.consume("client") for _ in range(3)], [0, 0, 0])
+        self.assertGreater(bucket.consume("client"), 0)
+
+    def test_clients_are_independent(self):
+        """Each client has its own bucket"""
+        bucket = TokenBucket(rate=1, capacity=1)
+        self.assertEqual(bucket.consume("one"), 0)
+        self.assertEqual(bucket.consume("two"), 0)
+
+
+class MissaPropersViewTests(TestCase):
+    """Tests for the missa propers endpoint"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.missa = make_missa()
+        antiphona = make_antiphona()
+        for name in ("Communio", "Introito"):
+            make_antiphona_missa(
+                antiphona=antiphona,
+                missa=cls.missa,
+                antiphona_type=AntiphonaType.objects.get(name=name),
+            )
+        cls.url = reverse("missa-propers", args=[cls.missa.id])
+
+    def setUp(self):
+        cache.clear()
+
+    def test_propers_in_template_order(self):
+        """Propers follow the MissaType order"""
+        data = self.client.get(self.url).json()
+        self.assertEqual(data["name"], "Dominica I Adventus")
+        self.assertEqual([p["antiphona_type"] for p in data["propers"]], ["Introito", "Communio"])
+
+    def test_propers_are_cached(self):
+        """A second request doesn't hit the database"""
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+    def test_edits_invalidate_cached_propers(self):
+        """Edits to the propers show up right away"""
+        self.client.get(self.url)
+        proper = self.missa.antiphona_missa_set.first()
+        proper.psalm = "Ps. 24, 1"
+        proper.save()
+        data = self.client.get(self.url).json()
+        self.assertIn("Ps. 24, 1", [p["psalm"] for p in data["propers"]])
+
+        make_suggestion(antiphona_missa=proper, song_name="Ad te Domine")
+        data = self.client.get(self.url).json()
+        self.assertEqual(
+            [s["song_name"] for p in data["propers"] for s in p["suggestions"]],
+            ["Ad te Domine"],
+        )
+
+        antiphona = proper.antiphona
+        antiphona.text = "Ad te Domine levavi animam meam"
+        antiphona.save()
+        data = self.client.get(self.url).json()
+        self.assertEqual({p["text"] for p in data["propers"]}, {antiphona.text})
+
+    def test_vocabulary_edits_invalidate_cached_propers(self):
+        """Renaming a documentum or antiphona type shows up right away"""
+        self.client.get(self.url)
+        documentum = Documentum.objects.get(name="Graduale Romanum")
+        documentum.name = "Graduale Romanum 1974"
+        documentum.save()
+        antiphona_type = AntiphonaType.objects.get(name="Communio")
+        antiphona_type.name = "Communionem"
+        antiphona_type.save()
+        data = self.client.get(self.url).json()
+        self.assertEqual({p["documentum"] for p in data["propers"]}, {"Graduale Romanum 1974"})
+        self.assertIn("Communionem", [p["antiphona_type"] for p in data["propers"]])
+
+    def test_missa_type_deletion_invalidates_cached_propers(self):
+        """Missae moved to the default type show it right away"""
+        missa_type = MissaType.objects.create(name="Vigilia Paschalis")
+        self.missa.missa_type = missa_type
+        self.missa.save()
+        self.assertEqual(self.client.get(self.url).json()["missa_type"], "Vigilia Paschalis")
+        missa_type.delete()
+        self.assertEqual(self.client.get(self.url).json()["missa_type"], "Dominica")
+
+    def test_missing_missa(self):
+        """Unknown missae answer 404"""
+        self.assertEqual(self.client.get(reverse("missa-propers", args=[0])).status_code, 404)
+
+    @override_settings(ANTIPHONA_RATE_LIMIT=(1, 2))
+    def test_rate_limited(self):
+        """Clients over their rate get 429"""
+        statuses = [self.client.get(self.url).status_code for _ in range(3)]
+        self.assertEqual(statuses, [200, 200, 429])
@@ -0,0 +1,105 @@
+"""
+Request coalescing and rate limiting for the hot endpoints.
+
+Both rely only on the Django cache API (add, get, set, delete), so they
+work the same with the local-memory backend inside one process and with
+a shared backend (memcached, redis, database) across workers.
+"""
+
+import time
+import uuid
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.http import JsonResponse
+
+
+def single_flight(key, compute, timeout=DEFAULT_TIMEOUT, lock_timeout=30, wait=10, poll_interval=0.05):
+    """
+    Returns the cached value for key, computing it at most once at a time.
+
+    On a miss, the first caller takes a lock with cache.add (which is
+    atomic) and computes the value; concurrent callers poll the cache
+    for its result instead of computing it again. If the result doesn't
+    show up within `wait` seconds, the caller computes it itself.
+    `timeout` defaults to the cache's own default timeout.
+    """
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    lock_key = f"{key}:lock"
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + wait
+    while not cache.add(lock_key, token, lock_timeout):
+        if time.monotonic() >= deadline:
+            return compute()
+        time.sleep(poll_interval)
+        value = cache.get(key)
+        if value is not None:
+            return value
+
+    try:
+        # the previous holder may have just released the lock
+        value = cache.get(key)
+        if value is None:
+            value = compute()
+            cache.set(key, value, timeout)
+        return value
+    finally:
+        # if computing outlived lock_timeout, the lock may be someone else's now
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+
+
+class TokenBucket:
+    """
+    A token bucket per client, kept in the cache.
+
+    Each client gets `capacity` tokens, refilled at `rate` tokens per
+    second, and each request takes one. The read-modify-write isn't
+    atomic on every backend, so under heavy contention a client may get
+    a few more requests through than its share; that's acceptable for
+    shedding load.
+    """
+
+    def __init__(self, rate, capacity, prefix='ratelimit'):
+        self.rate = rate
+        self.capacity = capacity
+        self.prefix = prefix
+
+    def consume(self, client):
+        """Takes a token for client. Returns the seconds to wait, 0 if allowed."""
+        key = f"{self.prefix}:{client}"
+        now = time.time()
+        tokens, last = cache.get(key, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - last) * self.rate)
+
+        if tokens >= 1:
+            wait = 0
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / self.rate
+        cache.set(key, (tokens, now), int(self.capacity / self.rate) + 1)
+        return wait
+
+
+def client_key(request):
+    """Identifies the client of a request."""
+    return request.META.get('REMOTE_ADDR', 'unknown')
+
+
+def rate_limit(view):
+    """Answers 429 Too Many Requests to the clients over ANTIPHONA_RATE_LIMIT."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        rate, capacity = settings.ANTIPHONA_RATE_LIMIT
+        wait = TokenBucket(rate, capacity).consume(client_key(request))
+        if wait:
+            response = JsonResponse({"error": "too many requests"}, status=429)
+            response['Retry-After'] = str(int(wait) + 1)
+            return response
+        return view(request, *args, **kwargs)
+    return wrapper
@@ -5,6 +5,9 @@ from django.urls import path
 from antiphona_app import views
 
 
-url_patterns = [
-    path('missae/', None, name='missae-index'),
+urlpatterns = [
+    path('changes/', views.changes, name='changes'),
+    path('missae/<int:missa_id>/', views.missa_propers, name='missa-propers'),
+    path('snapshots/', views.snapshots, name='snapshots'),
+    path('snapshots/<str:name>', views.snapshot_file, name='snapshot-file'),
 ]
@@ -1,3 +1,110 @@
-from django.shortcuts import render
+"""This is where the Views live."""
 
-# Create your views here.
+import os
+import re
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse
+from django.views.decorators.http import require_GET, require_safe
+
+from antiphona_app.changes import DEFAULT_PAGE_SIZE, changes_since, serialize_change
+from antiphona_app.models import Missa
+from antiphona_app.propers import build_propers, propers_cache_key
+from antiphona_app.snapshots import FILENAME_RE, list_snapshots
+from antiphona_app.throttling import rate_limit, single_flight
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def _int_param(request, name, default):
+    """Returns a non-negative integer query parameter, or None if invalid."""
+    try:
+        value = int(request.GET.get(name, default))
+    except ValueError:
+        return None
+    return value if value >= 0 else None
+
+
+@require_GET
+def changes(request):
+    """Paginated feed of the changes after the `since` sequence number."""
+    since = _int_param(request, 'since', 0)
+    limit = _int_param(request, 'limit', DEFAULT_PAGE_SIZE)
+    if since is None or limit is None:
+        return JsonResponse({"error": "since and limit must be non-negative integers"}, status=400)
+
+    entries, next_since, has_more = changes_since(since, limit)
+    return JsonResponse({
+        "since": since,
+        "next_since": next_since,
+        "has_more": has_more,
+        "results": [serialize_change(entry) for entry in entries],
+    })
+
+
+@require_GET
+@rate_limit
+def missa_propers(request, missa_id):
+    """Propers of a Missa, built by a single worker at a time on cache misses."""
+    try:
+        propers = single_flight(
+            propers_cache_key(missa_id),
+            lambda: build_propers(missa_id),
+            timeout=settings.ANTIPHONA_PROPERS_CACHE_TIMEOUT,
+        )
+    except Missa.DoesNotExist:
+        raise Http404("No such Missa")
+    return JsonResponse(propers)
+
+
+@require_safe
+def snapshots(request):
+    """Lists the snapshots available for download."""
+    return JsonResponse({"results": list_snapshots()})
+
+
+def _byte_range(header, size):
+    """
+    Returns the (start, end) inclusive offsets of a single-range Range
+    header, None to serve the whole file, or False if unsatisfiable.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match or not any(match.groups()):
+        return None
+    start, end = match.groups()
+    if not start:
+        start, end = max(0, size - int(end)), size - 1
+    elif not end:
+        start, end = int(start), size - 1
+    else:
+        start, end = int(start), min(int(end), size - 1)
+    if start > end or start >= size:
+        return False
+    return start, end
+
+
+@require_safe
+def snapshot_file(request, name):
+    """Serves a snapshot, supporting single byte ranges to resume downloads."""
+    if not FILENAME_RE.match(name):
+        raise Http404("No such snapshot")
+    path = os.path.join(settings.ANTIPHONA_SNAPSHOT_DIR, name)
+    if not os.path.isfile(path):
+        raise Http404("No such snapshot")
+
+    size = os.path.getsize(path)
+    byte_range = _byte_range(request.META.get('HTTP_RANGE', ''), size)
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f"bytes */{size}"
+    elif byte_range is None:
+        response = FileResponse(open(path, 'rb'), as_attachment=True, filename=name)
+    else:
+        start, end = byte_range
+        with open(path, 'rb') as snapshot:
+            snapshot.seek(start)
+            response = HttpResponse(snapshot.read(end - start + 1), status=206)
+        response['Content-Type'] = 'application/octet-stream'
+        response['Content-Range'] = f"bytes {start}-{end}/{size}"
+    response['Accept-Ranges'] = 'bytes'
+    return response
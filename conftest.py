@@ -0,0 +1,20 @@
+"""
+pytest configuration.
+
+Run `pytest --nomigrations` to build the test schema straight from the
+models instead of replaying the migrations; the vocabulary that
+migration 0002 populates is then loaded from a fixture. Add
+`--reuse-db` to keep the test database between runs and `-n auto`
+(pytest-xdist) to run the tests in parallel, one database per worker.
+"""
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.fixture(scope='session')
+def django_db_setup(request, django_db_setup, django_db_blocker):
+    """Loads the vocabulary when the migrations didn't populate it."""
+    if request.config.getoption('nomigrations'):
+        with django_db_blocker.unblock():
+            call_command('loaddata', 'vocabulary', verbosity=0)